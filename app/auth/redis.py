@@ -1,52 +1,133 @@
-# app/auth/redis.py
 """
 Redis token blacklist management.
-Uses modern redis library (aioredis is deprecated for Python 3.12).
+Uses the asyncio client bundled with redis-py (aioredis is deprecated for Python 3.12).
 """
 
-import redis
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import redis.asyncio as aioredis
 from app.core.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+@lru_cache()
+def get_connection_pool():
+    """
+    Shared connection pool so every request reuses open TCP connections.
+    Created on first use, so importing the app never touches Redis.
+    RESP3 replies are parsed by hiredis (redis[hiredis]) when it is installed;
+    redis.utils.HIREDIS_AVAILABLE / _HiredisParser is picked automatically,
+    so keep the extra in requirements.txt.
+    """
+    return aioredis.ConnectionPool(
+        host=getattr(settings, 'REDIS_HOST', 'localhost'),
+        port=getattr(settings, 'REDIS_PORT', 6379),
+        db=0,
+        decode_responses=True,
+        max_connections=50,
+        socket_connect_timeout=5,
+        socket_keepalive=True,
+        health_check_interval=30,
+        retry_on_timeout=True,
+        protocol=3
+    )
+
+# JTIs recently confirmed as not blacklisted, mapped to their expiry (LRU-capped)
+_NEG_TTL = 30
+_NEG_CACHE_SIZE = 10_000
+_neg_cache: "OrderedDict[str, float]" = OrderedDict()
+
+# Circuit breaker: after a Redis failure, skip Redis until this monotonic time
+_BREAKER_COOLDOWN = 10
+_breaker_until: float = 0
 
-# Initialize Redis client
-_redis_client = None
+def _breaker_open() -> bool:
+    """Return True while Redis calls are being skipped after a failure"""
+    return time.monotonic() < _breaker_until
 
+def _record_failure():
+    """Open the breaker for the cooldown period"""
+    global _breaker_until
+    _breaker_until = time.monotonic() + _BREAKER_COOLDOWN
+
+def _record_success():
+    """Close the breaker"""
+    global _breaker_until
+    _breaker_until = 0
+
+@lru_cache()
 def get_redis_client():
-    """Get or create Redis client"""
-    global _redis_client
-    if _redis_client is None:
-        try:
-            _redis_client = redis.Redis(
-                host=getattr(settings, 'REDIS_HOST', 'localhost'),
-                port=getattr(settings, 'REDIS_PORT', 6379),
-                db=0,
-                decode_responses=True,
-                socket_connect_timeout=5
-            )
-            _redis_client.ping()
-        except Exception as e:
-            print(f"Warning: Could not connect to Redis: {e}")
-            _redis_client = None
-    return _redis_client
+    """Get or create Redis client (no eager ping; the first command connects)"""
+    return aioredis.Redis(connection_pool=get_connection_pool())
 
 
 async def add_to_blacklist(jti: str, exp: int):
     """Add a token's JTI to the blacklist"""
-    redis_client = get_redis_client()
-    if redis_client:
-        try:
-            redis_client.setex(f"blacklist:{jti}", exp, "1")
-        except Exception as e:
-            print(f"Error adding to blacklist: {e}")
+    _neg_cache.pop(jti, None)
+    if _breaker_open():
+        return
+    try:
+        await get_redis_client().setex(f"blacklist:{jti}", exp, "1")
+    except Exception:
+        _record_failure()
+        logger.warning("Error adding to blacklist", exc_info=True)
+        return
+    _record_success()
+
+
+def _cached_not_blacklisted(jti: str, now: float) -> bool:
+    """Return True if the JTI has a live negative cache entry"""
+    expires = _neg_cache.get(jti)
+    if expires is None:
+        return False
+    if expires > now:
+        _neg_cache.move_to_end(jti)
+        return True
+    del _neg_cache[jti]
+    return False
+
+
+def _remember_not_blacklisted(jti: str, now: float):
+    """Cache a negative answer, dropping the least recently used entry when full"""
+    _neg_cache[jti] = now + _NEG_TTL
+    if len(_neg_cache) > _NEG_CACHE_SIZE:
+        _neg_cache.popitem(last=False)
+
+
+async def are_blacklisted(jtis: list[str]) -> list[bool]:
+    """
+    Check several JTIs against the blacklist.
+    Uncached JTIs are queued on a non-transactional pipeline and sent to
+    Redis in a single write, so the whole batch costs one round-trip.
+    """
+    now = time.monotonic()
+    results = [False] * len(jtis)
+    pending = [i for i, jti in enumerate(jtis) if not _cached_not_blacklisted(jti, now)]
+    if not pending or _breaker_open():
+        return results
+
+    try:
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            for i in pending:
+                pipe.exists(f"blacklist:{jtis[i]}")
+            replies = await pipe.execute()
+    except Exception:
+        _record_failure()
+        logger.warning("Error checking blacklist", exc_info=True)
+        return results
+    _record_success()
+    for i, reply in zip(pending, replies):
+        if reply:
+            results[i] = True
+        else:
+            _remember_not_blacklisted(jtis[i], now)
+    return results
 
 
 async def is_blacklisted(jti: str) -> bool:
     """Check if a token's JTI is blacklisted"""
-    redis_client = get_redis_client()
-    if redis_client:
-        try:
-            return redis_client.exists(f"blacklist:{jti}") > 0
-        except Exception as e:
-            print(f"Error checking blacklist: {e}")
-    return False
\ No newline at end of file
+    return (await are_blacklisted([jti]))[0]
@@ -17,7 +17,7 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = "fallback-secret-key"  # ADD THIS
-    BCRYPT_ROUNDS: int = 12
+    BCRYPT_ROUNDS: int = 12  # Read from env; the test suite lowers it to 4
     CORS_ORIGINS: List[str] = ["*"]
     
     # Redis - ADD THESE
@@ -32,9 +32,6 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
-
-
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
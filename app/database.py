@@ -1,32 +1,111 @@
 # app/database.py
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from app.core.config import settings
+from sqlalchemy.pool import StaticPool
+from app.core.config import get_settings
+
+settings = get_settings()
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-# Create the default engine and sessionmaker
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Connection pool sizing for server databases (SQLite keeps its default pool)
+POOL_OPTIONS = {
+    "pool_size": 20,
+    "max_overflow": 10,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True,
+}
+
+def _is_sqlite_memory(database_url: str) -> bool:
+    """Return True for SQLite URLs that point at an in-memory database."""
+    url = make_url(database_url)
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+def _engine_options(database_url: str) -> dict:
+    """Return the pool options that apply to the given database URL."""
+    if "sqlite" in database_url:
+        options = {"connect_args": {"check_same_thread": False}}
+        if _is_sqlite_memory(database_url):
+            # Every new connection would open its own empty database, so share one
+            options["poolclass"] = StaticPool
+        return options
+    return dict(POOL_OPTIONS)
+
+def _async_url(database_url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (asyncpg / aiosqlite)."""
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if database_url.startswith("sqlite://"):
+        return database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return database_url
 
 Base = declarative_base()
 
+# Engines are cached by URL (one engine, and so one pool, per database URL);
+# the public getters pass the URL positionally so defaulted and explicit calls
+# share a cache entry.
+@lru_cache()
+def _cached_engine(database_url: str):
+    return create_engine(database_url, **_engine_options(database_url))
+
+@lru_cache()
+def _cached_async_engine(database_url: str):
+    return create_async_engine(_async_url(database_url), **_engine_options(database_url))
+
+def get_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
+    """Return the shared SQLAlchemy engine for the given URL, creating it on first use."""
+    return _cached_engine(database_url)
+
+def get_async_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
+    """
+    Return the shared asyncio engine for the given URL, creating it on first use.
+    Needs the optional drivers from requirements-async.txt.
+    """
+    return _cached_async_engine(database_url)
+
+def get_sessionmaker(engine):
+    """Factory function to create a new sessionmaker bound to the given engine."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@lru_cache()
+def get_session_local():
+    """Sessionmaker for the default (sync) engine, used by the routes and scripts."""
+    return get_sessionmaker(get_engine())
+
+@lru_cache()
+def get_async_session_local():
+    """Sessionmaker for the default async engine, used by `async def` endpoints."""
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+# Lazily created module attributes, kept for `database.engine`-style access
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "SessionLocal": get_session_local,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_session_local,
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_db():
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         yield db
     finally:
         db.close()
 
-def get_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
-    """Factory function to create a new SQLAlchemy engine."""
-    if "sqlite" in database_url:
-        return create_engine(database_url, connect_args={"check_same_thread": False})
-    return create_engine(database_url)
-
-def get_sessionmaker(engine):
-    """Factory function to create a new sessionmaker bound to the given engine."""
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+async def get_async_db():
+    """Yield an AsyncSession that does not block the event loop while waiting on the database."""
+    async with get_async_session_local()() as db:
+        yield db
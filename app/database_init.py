@@ -1,13 +1,13 @@
 # app/database_init.py
-from app.database import Base, engine
+from app.database import Base, get_engine
 
 def init_db():
     """Create all database tables."""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 def drop_db():
     """Drop all database tables."""
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=get_engine())
 
 if __name__ == "__main__":
     init_db()  # pragma: no cover
\ No newline at end of file
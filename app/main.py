@@ -5,7 +5,7 @@ from typing import List
 
 from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Form
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.exc import IntegrityError
@@ -22,14 +22,14 @@ from app.schemas.user import (
     UserCreate, UserResponse, UserLogin,
     UserProfileUpdate, PasswordChange, UserProfileResponse
 )
-from app.database import Base, get_db, engine
+from app.database import Base, get_db, get_engine
 
 
 # Create tables on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     print("Tables created successfully!")
     yield
 
@@ -37,7 +37,8 @@ app = FastAPI(
     title="Calculations API",
     description="API for managing calculations",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 # Mount the static files directory
 app.mount("/static", StaticFiles(directory="static"), name="static")
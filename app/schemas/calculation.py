@@ -122,6 +122,7 @@ class CalculationResponse(CalculationBase):
 
     model_config = ConfigDict(
         from_attributes=True,
+        frozen=True,
         json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174999",
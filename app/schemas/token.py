@@ -53,6 +53,7 @@ class TokenResponse(BaseModel):
 
     model_config = ConfigDict(
         from_attributes=True,
+        frozen=True,
         json_schema_extra={
             "example": {
                 "access_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...",
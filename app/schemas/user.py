@@ -1,49 +1,96 @@
 """
 User-related Pydantic schemas for validation and serialization.
 """
-from pydantic import BaseModel, EmailStr, field_validator, ConfigDict
-from typing import Optional
+import hmac
+import re
+from pydantic import (
+    BaseModel, EmailStr, field_validator, ConfigDict, StringConstraints, ValidationError, WrapValidator
+)
+from typing import Annotated, Optional
 from datetime import datetime
 from uuid import UUID
 
 
+# Password policy checked in a single pass for the common ASCII case. When the
+# combined pattern misses, the per-rule checks decide (with Unicode-aware case
+# and digit tests, so e.g. "É" counts as uppercase) and pick the error message.
+_SPECIAL_CHARACTERS = "!@#$%^&*"
+_SPECIAL_CLASS = f"[{re.escape(_SPECIAL_CHARACTERS)}]"
+_PASSWORD_RE = re.compile(rf"(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*{_SPECIAL_CLASS}).{{8,}}", re.DOTALL)
+_PASSWORD_RULES = (
+    (str.isupper, 'Password must contain uppercase letter'),
+    (str.islower, 'Password must contain lowercase letter'),
+    (str.isdigit, 'Password must contain digit'),
+    (_SPECIAL_CHARACTERS.__contains__, f'Password must contain special character ({_SPECIAL_CHARACTERS})'),
+)
+
+# Username length and characters (ASCII letters, digits, _ and -) are checked by
+# pydantic-core; only the error messages are ours. pydantic-core's regex engine has
+# no lookaheads (nor has the password pattern), so "at least one letter or digit"
+# is checked after the pattern has matched.
+_USERNAME_MESSAGES = {
+    "string_too_short": 'Username must be at least 3 characters',
+    "string_pattern_mismatch": 'Username can only contain letters, numbers, _, -',
+}
+_USERNAME_ALNUM_RE = re.compile(r"[A-Za-z0-9]")
+
+
+def _username_messages(v, handler):
+    """Replace pydantic-core's generic length/pattern errors with the username messages."""
+    try:
+        username = handler(v)
+    except ValidationError as exc:
+        message = _USERNAME_MESSAGES.get(exc.errors()[0]["type"])
+        if message is None:
+            raise
+        raise ValueError(message) from None
+    if not _USERNAME_ALNUM_RE.search(username):
+        raise ValueError('Username must contain at least one letter or number')
+    return username
+
+
+Username = Annotated[
+    str,
+    StringConstraints(min_length=3, pattern=r"^[A-Za-z0-9_-]+$"),
+    WrapValidator(_username_messages),
+]
+
+
+def _check_password_strength(v: str) -> str:
+    """Validate a new password against the password policy."""
+    if _PASSWORD_RE.match(v):
+        return v
+    if len(v) < 8:
+        raise ValueError('Password must be at least 8 characters')
+    for is_match, message in _PASSWORD_RULES:
+        if not any(is_match(c) for c in v):
+            raise ValueError(message)
+    return v
+
+
+def _same_password(a: str, b: str) -> bool:
+    """Constant-time comparison; strings are encoded since compare_digest rejects non-ASCII str."""
+    return hmac.compare_digest(a.encode(), b.encode())
+
+
 class UserCreate(BaseModel):
     """Schema for user registration."""
-    username: str
+    username: Username
     email: EmailStr
     password: str
     confirm_password: str
     first_name: str
     last_name: str
 
-    @field_validator('username')
-    @classmethod
-    def username_valid(cls, v):
-        if not v or len(v) < 3:
-            raise ValueError('Username must be at least 3 characters')
-        if not v.replace('_', '').replace('-', '').isalnum():
-            raise ValueError('Username can only contain letters, numbers, _, -')
-        return v
-
     @field_validator('password')
     @classmethod
     def password_valid(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain digit')
-        if not any(c in '!@#$%^&*' for c in v):
-            raise ValueError('Password must contain special character (!@#$%^&*)')
-        return v
+        return _check_password_strength(v)
 
     @field_validator('confirm_password')
     @classmethod
     def passwords_match(cls, v, info):
-        if 'password' in info.data and v != info.data['password']:
+        if 'password' in info.data and not _same_password(v, info.data['password']):
             raise ValueError('Passwords do not match')
         return v
 
@@ -71,7 +118,7 @@ class UserLogin(BaseModel):
     username: str
     password: str
 
-    model_config = ConfigDict(json_schema_extra={
+    model_config = ConfigDict(frozen=True, json_schema_extra={
         "example": {
             "username": "johndoe",
             "password": "SecurePass@123"
@@ -91,25 +138,16 @@ class UserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class UserProfileUpdate(BaseModel):
     """Schema for updating user profile (not password)."""
-    username: str
+    username: Username
     email: EmailStr
     first_name: str
     last_name: str
 
-    @field_validator('username')
-    @classmethod
-    def username_alphanumeric(cls, v):
-        if not v or len(v) < 3:
-            raise ValueError('Username must be at least 3 characters')
-        if not v.replace('_', '').replace('-', '').isalnum():
-            raise ValueError('Username can only contain letters, numbers, _, -')
-        return v
-
     @field_validator('first_name', 'last_name')
     @classmethod
     def name_not_empty(cls, v):
@@ -143,22 +181,12 @@ class PasswordChange(BaseModel):
     @field_validator('new_password')
     @classmethod
     def new_password_valid(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain digit')
-        if not any(c in '!@#$%^&*' for c in v):
-            raise ValueError('Password must contain special character (!@#$%^&*)')
-        return v
+        return _check_password_strength(v)
 
     @field_validator('confirm_password')
     @classmethod
     def passwords_match(cls, v, info):
-        if 'new_password' in info.data and v != info.data['new_password']:
+        if 'new_password' in info.data and not _same_password(v, info.data['new_password']):
             raise ValueError('Passwords do not match')
         return v
 
@@ -182,4 +210,10 @@ class UserProfileResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+# Make sure every schema is fully built at import time, so no request pays
+# for a deferred rebuild (e.g. after a forward reference is resolved).
+for _model in (UserCreate, UserLogin, UserResponse, UserProfileUpdate, PasswordChange, UserProfileResponse):
+    _model.model_rebuild()
+del _model
@@ -1,16 +1,29 @@
+import asyncio
+import itertools
 import logging
-from typing import Generator, Dict, List
+import os
+import uuid
+from types import MappingProxyType
+from typing import AsyncGenerator, Generator, Dict, List, Mapping, Optional
 from contextlib import contextmanager
 
 import pytest
 import pytest_asyncio
 from faker import Faker
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from passlib.context import CryptContext
+
+# Cheap password hashing for tests; must be set before the app reads its settings
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ.setdefault("TESTING", "1")
 
 from app.main import app
+from app.auth import jwt as auth_jwt
 from app.database import Base, get_db, get_engine, get_sessionmaker
+from app.models.calculation import Calculation
 from app.models.user import User
 
 # ======================================================================================
@@ -27,24 +40,76 @@ logger = logging.getLogger(__name__)
 # ======================================================================================
 fake = Faker()
 Faker.seed(12345)
+# Sequence for unique emails/usernames (cheaper than Faker's growing unique set)
+_user_ids = itertools.count()
 
-TEST_DATABASE_URL = "sqlite:///./test.db"
+TEST_DATABASE_URL = "sqlite:///:memory:"
 test_engine = get_engine(database_url=TEST_DATABASE_URL)
 TestingSessionLocal = get_sessionmaker(engine=test_engine)
 
+# pysqlite starts transactions lazily and breaks SAVEPOINT; let SQLAlchemy emit BEGIN itself.
+# Test data is disposable, so also skip fsync and keep the journal in memory (matters if
+# TEST_DATABASE_URL is pointed at a file).
+@event.listens_for(test_engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.close()
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+# Session of the currently running test, shared with the app through get_db
+_active_session: Optional[Session] = None
+
 # ======================================================================================
 # Helper Functions
 # ======================================================================================
 def create_fake_user() -> Dict[str, str]:
     """Generate fake user data."""
+    n = next(_user_ids)
     return {
         "first_name": fake.first_name(),
         "last_name": fake.last_name(),
-        "email": fake.unique.email(),
-        "username": fake.unique.user_name(),
+        "email": f"user_{n}@example.com",
+        "username": f"user_{n}",
         "password": "TestPass@123"
     }
 
+def create_user_direct(db: Session, user_data: Dict[str, str]) -> User:
+    """Create and commit a user through the model layer, skipping the HTTP API."""
+    user = User.register(db, user_data)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def bearer_headers(user: User) -> Mapping[str, str]:
+    """Mint an access token in-process and return read-only Bearer auth headers."""
+    token = User.create_access_token({"sub": str(user.id)})
+    # Read-only, since fixtures share one headers mapping across many tests
+    return MappingProxyType({"Authorization": f"Bearer {token}"})
+
+def create_authenticated_user(user_data: Dict[str, str]) -> Dict[str, object]:
+    """Commit a user outside any test transaction and return its data, id and headers."""
+    with managed_db_session() as db:
+        user = create_user_direct(db, user_data)
+        return {**user_data, "id": user.id, "headers": bearer_headers(user)}
+
+def seed_calculations(db: Session, user_id, n: int) -> List[Calculation]:
+    """Insert n addition calculations for a user in one batched INSERT."""
+    calculations = list(db.scalars(
+        insert(Calculation).returning(Calculation),
+        [
+            {"type": "addition", "inputs": [i, i + 1], "result": 2 * i + 1, "user_id": user_id}
+            for i in range(n)
+        ]
+    ))
+    db.commit()
+    return calculations
+
 @contextmanager
 def managed_db_session():
     """Context manager for safe database session handling."""
@@ -65,12 +130,8 @@ def managed_db_session():
 def setup_test_database(request):
     """Set up test database before all tests."""
     logger.info("Creating tables...")
-    try:
-        Base.metadata.create_all(bind=test_engine)
-        logger.info("Tables created successfully!")
-    except Exception as e:
-        logger.error(f"Error setting up test database: {str(e)}")
-        raise
+    Base.metadata.create_all(bind=test_engine, checkfirst=True)
+    logger.info("Tables created successfully!")
 
     yield  # Tests run here
 
@@ -81,36 +142,61 @@ def setup_test_database(request):
         except Exception as e:
             logger.warning(f"Error dropping tables: {e}")
 
+@pytest.fixture(scope="session", autouse=True)
+def fast_hasher():
+    """Swap bcrypt for SHA-256 while TESTING=1; the tests check behavior, not hash strength."""
+    if os.environ.get("TESTING") != "1":
+        yield
+        return
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth_jwt, "pwd_context", CryptContext(schemes=["hex_sha256"]))
+        yield
+
 @pytest.fixture
 def db_session() -> Generator[Session, None, None]:
-    """Provide test database session."""
-    session = TestingSessionLocal()
+    """
+    Provide a test database session that is rolled back after the test.
+
+    The session is bound to a connection-level transaction; its own commits and
+    rollbacks only release or roll back SAVEPOINTs, so nothing outlives the test.
+    """
+    global _active_session
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    _active_session = session
     try:
         yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
     finally:
+        _active_session = None
         session.close()
+        transaction.rollback()
+        connection.close()
 
 # ======================================================================================
 # FastAPI Client Fixture
 # ======================================================================================
-@pytest.fixture
-def client(db_session: Session):
-    """Provide TestClient for FastAPI app."""
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-    
+def override_get_db():
+    """Hand the app the current test's session (see rollback_client_writes)."""
+    assert _active_session is not None, "app request made outside a db_session test"
+    yield _active_session
+
+# Modules using the client must run their tests on the session loop as well:
+# pytestmark = pytest.mark.asyncio(loop_scope="session")
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client() -> AsyncGenerator[AsyncClient, None]:
+    """Provide a single in-process AsyncClient for the FastAPI app for the whole session."""
     app.dependency_overrides[get_db] = override_get_db
-    test_client = TestClient(app)
-    yield test_client
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
     app.dependency_overrides.clear()
 
+@pytest.fixture(autouse=True)
+def rollback_client_writes(request):
+    """Run every test that talks to the app inside a rolled-back db_session."""
+    if "client" in request.fixturenames:
+        request.getfixturevalue("db_session")
+
 # ======================================================================================
 # Test Data Fixtures
 # ======================================================================================
@@ -122,10 +208,7 @@ def fake_user_data() -> Dict[str, str]:
 @pytest.fixture
 def test_user(db_session: Session) -> User:
     """Create test user in database."""
-    user_data = create_fake_user()
-    user = User.register(db_session, user_data)
-    db_session.commit()
-    db_session.refresh(user)
+    user = create_user_direct(db_session, create_fake_user())
     logger.info(f"Created test user ID: {user.id}")
     return user
 
@@ -133,41 +216,46 @@ def test_user(db_session: Session) -> User:
 def seed_users(db_session: Session, request) -> List[User]:
     """Seed multiple test users."""
     num_users = getattr(request, "param", 5)
-    users = []
-    for _ in range(num_users):
-        user_data = create_fake_user()
-        user = User.register(db_session, user_data)
-        users.append(user)
+    users_data = [create_fake_user() for _ in range(num_users)]
+    # Every fake user shares the same password, so hash it once
+    hashed_password = User.hash_password(users_data[0]["password"])
+    users = list(db_session.scalars(
+        insert(User).returning(User),
+        [
+            {**user_data, "password": hashed_password, "is_active": True, "is_verified": False}
+            for user_data in users_data
+        ]
+    ))
     db_session.commit()
     logger.info(f"Seeded {len(users)} users.")
     return users
 
 @pytest.fixture
-def auth_headers(client: TestClient) -> Dict[str, str]:
+def seeded_calculations(db_session: Session, authenticated_user: Dict[str, object]) -> List[Calculation]:
+    """Two calculations owned by the class's authenticated_user, rolled back after the test."""
+    return seed_calculations(db_session, authenticated_user["id"], 2)
+
+@pytest.fixture
+def auth_headers(db_session: Session) -> Mapping[str, str]:
     """Create authenticated user and return headers."""
-    user_data = create_fake_user()
-    # Register
-    reg_response = client.post(
-        "/auth/register",
-        json={
-            **user_data,
-            "confirm_password": user_data["password"]
-        }
-    )
-    if reg_response.status_code not in [200, 201]:
-        pytest.skip(f"Registration failed: {reg_response.json()}")
-    # Login
-    login_response = client.post(
-        "/auth/login",
-        json={
-            "username": user_data["username"],
-            "password": user_data["password"]
-        }
-    )
-    if login_response.status_code != 200:
-        pytest.skip(f"Login failed: {login_response.json()}")
-    token = login_response.json().get("access_token") or login_response.json().get("token")
-    return {"Authorization": f"Bearer {token}"}
+    return bearer_headers(create_user_direct(db_session, create_fake_user()))
+
+@pytest.fixture(scope="class")
+def authenticated_user() -> Dict[str, object]:
+    """One logged-in user shared by every test in the class."""
+    return create_authenticated_user(create_fake_user())
+
+@pytest.fixture(scope="session")
+def primary_user_token() -> Mapping[str, str]:
+    """Headers for one user shared by the whole session; tests must not modify the user."""
+    return create_authenticated_user(create_fake_user())["headers"]
+
+@pytest.fixture(scope="session")
+def secondary_user_token() -> Mapping[str, str]:
+    """Headers for a second session-wide user, for cross-user checks."""
+    return create_authenticated_user(
+        {**create_fake_user(), "username": f"otheruser_{uuid.uuid4().hex[:8]}"}
+    )["headers"]
 
 @pytest.fixture
 def test_user_data() -> Dict[str, str]:
@@ -180,14 +268,13 @@ def test_user_data() -> Dict[str, str]:
 @pytest.fixture(scope="session")
 def event_loop_policy():
     """Set event loop policy for async tests."""
-    import asyncio
     if hasattr(asyncio, 'WindowsProactorEventLoopPolicy'):
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
     return None
 
-@pytest_asyncio.fixture
-async def page():
-    """Provide Playwright browser page for E2E tests."""
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def browser():
+    """Launch one headless Chromium per test session (i.e. per xdist worker)."""
     try:
         from playwright.async_api import async_playwright
     except ImportError:
@@ -195,12 +282,20 @@ async def page():
         return
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-        yield page
-        await context.close()
+        yield browser
         await browser.close()
 
+@pytest_asyncio.fixture(loop_scope="session")
+async def page(browser):
+    """Provide a Playwright page in a fresh browser context for E2E tests."""
+    context = await browser.new_context()
+    page = await context.new_page()
+    # Localhost answers in milliseconds; fail fast instead of waiting the default 30s
+    page.set_default_timeout(5000)
+    page.set_default_navigation_timeout(5000)
+    yield page
+    await context.close()
+
 @pytest.fixture(scope="session")
 def fastapi_server():
     """Provide FastAPI test server URL - PORT 8001."""
@@ -211,13 +306,12 @@ def base_url(fastapi_server: str) -> str:
     """Provide base URL for E2E tests."""
     return fastapi_server
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(loop_scope="session")
 async def test_user_login(page, base_url):
     """
     Registers a new user through the API, logs in to get JWT,
     then sets JWT in localStorage for Playwright browser session.
     """
-    import uuid
     username = f"e2euser_{uuid.uuid4().hex[:8]}"
     password = "TestPass@123"
     email = f"{username}@test.com"
@@ -254,6 +348,12 @@ async def test_user_login(page, base_url):
         "base_url": base_url
     }
 
+@pytest_asyncio.fixture(loop_scope="session")
+async def profile_page(page, test_user_login):
+    """The logged-in test user's /profile page, already loaded."""
+    await page.goto(f"{test_user_login['base_url']}/profile")
+    return page
+
 # ======================================================================================
 # Pytest Options
 # ======================================================================================
@@ -3,11 +3,25 @@ import pytest
 from fastapi import status
 from sqlalchemy.orm import Session
 
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+# Request bodies shared by the tests; build a new dict when a test needs a variant
+VALID_PROFILE_UPDATE = {
+    "username": "newusername",
+    "email": "newemail@example.com",
+    "first_name": "Jane",
+    "last_name": "Smith"
+}
+VALID_PASSWORD_CHANGE = {
+    "old_password": "OldPass@123",
+    "new_password": "NewPass@123",
+    "confirm_password": "NewPass@123"
+}
+
 
-@pytest.mark.asyncio
 async def test_get_profile_authenticated(client, auth_headers, db_session):
     """Test getting profile while authenticated"""
-    response = client.get("/api/profile", headers=auth_headers)
+    response = await client.get("/api/profile", headers=auth_headers)
     
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
@@ -22,23 +36,15 @@ async def test_get_profile_authenticated(client, auth_headers, db_session):
     assert data["email"]
 
 
-@pytest.mark.asyncio
 async def test_get_profile_unauthenticated(client):
     """Test getting profile without authentication fails"""
-    response = client.get("/api/profile")
+    response = await client.get("/api/profile")
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-@pytest.mark.asyncio
 async def test_update_profile_success(client, auth_headers):
     """Test successfully updating profile"""
-    update_data = {
-        "username": "newusername",
-        "email": "newemail@example.com",
-        "first_name": "Jane",
-        "last_name": "Smith"
-    }
-    response = client.put("/api/profile", json=update_data, headers=auth_headers)
+    response = await client.put("/api/profile", json=VALID_PROFILE_UPDATE, headers=auth_headers)
     
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
@@ -48,126 +54,84 @@ async def test_update_profile_success(client, auth_headers):
     assert data["last_name"] == "Smith"
 
 
-@pytest.mark.asyncio
 async def test_update_profile_invalid_username(client, auth_headers):
     """Test updating profile with invalid username fails"""
-    update_data = {
-        "username": "ab",  # Too short
-        "email": "newemail@example.com",
-        "first_name": "Jane",
-        "last_name": "Smith"
-    }
-    response = client.put("/api/profile", json=update_data, headers=auth_headers)
+    update_data = {**VALID_PROFILE_UPDATE, "username": "ab"}  # Too short
+    response = await client.put("/api/profile", json=update_data, headers=auth_headers)
     
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.asyncio
 async def test_update_profile_invalid_email(client, auth_headers):
     """Test updating profile with invalid email fails"""
-    update_data = {
-        "username": "newusername",
-        "email": "not-an-email",
-        "first_name": "Jane",
-        "last_name": "Smith"
-    }
-    response = client.put("/api/profile", json=update_data, headers=auth_headers)
+    update_data = {**VALID_PROFILE_UPDATE, "email": "not-an-email"}
+    response = await client.put("/api/profile", json=update_data, headers=auth_headers)
     
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.asyncio
 async def test_update_profile_empty_name(client, auth_headers):
     """Test updating profile with empty name fails"""
-    update_data = {
-        "username": "newusername",
-        "email": "newemail@example.com",
-        "first_name": "",
-        "last_name": "Smith"
-    }
-    response = client.put("/api/profile", json=update_data, headers=auth_headers)
+    update_data = {**VALID_PROFILE_UPDATE, "first_name": ""}
+    response = await client.put("/api/profile", json=update_data, headers=auth_headers)
     
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.asyncio
 async def test_change_password_success(client, auth_headers, test_user_data):
     """Test successfully changing password"""
-    change_data = {
-        "old_password": test_user_data["password"],
-        "new_password": "NewPass@123",
-        "confirm_password": "NewPass@123"
-    }
-    response = client.post("/api/change-password", json=change_data, headers=auth_headers)
+    change_data = {**VALID_PASSWORD_CHANGE, "old_password": test_user_data["password"]}
+    response = await client.post("/api/change-password", json=change_data, headers=auth_headers)
     
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert "Password changed successfully" in data["message"]
 
 
-@pytest.mark.asyncio
 async def test_change_password_wrong_old_password(client, auth_headers):
     """Test changing password with wrong old password fails"""
-    change_data = {
-        "old_password": "WrongPassword@123",
-        "new_password": "NewPass@123",
-        "confirm_password": "NewPass@123"
-    }
-    response = client.post("/api/change-password", json=change_data, headers=auth_headers)
+    change_data = {**VALID_PASSWORD_CHANGE, "old_password": "WrongPassword@123"}
+    response = await client.post("/api/change-password", json=change_data, headers=auth_headers)
     
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     data = response.json()
     assert "Current password is incorrect" in data["detail"]
 
 
-@pytest.mark.asyncio
 async def test_change_password_passwords_dont_match(client, auth_headers, test_user_data):
     """Test changing password when passwords don't match fails"""
     change_data = {
+        **VALID_PASSWORD_CHANGE,
         "old_password": test_user_data["password"],
-        "new_password": "NewPass@123",
         "confirm_password": "DifferentPass@456"
     }
-    response = client.post("/api/change-password", json=change_data, headers=auth_headers)
+    response = await client.post("/api/change-password", json=change_data, headers=auth_headers)
     
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.asyncio
 async def test_change_password_invalid_new_password(client, auth_headers, test_user_data):
     """Test changing password with invalid new password fails"""
     change_data = {
+        **VALID_PASSWORD_CHANGE,
         "old_password": test_user_data["password"],
         "new_password": "short",
         "confirm_password": "short"
     }
-    response = client.post("/api/change-password", json=change_data, headers=auth_headers)
+    response = await client.post("/api/change-password", json=change_data, headers=auth_headers)
     
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.asyncio
 async def test_change_password_unauthenticated(client):
     """Test changing password without authentication fails"""
-    change_data = {
-        "old_password": "OldPass@123",
-        "new_password": "NewPass@123",
-        "confirm_password": "NewPass@123"
-    }
-    response = client.post("/api/change-password", json=change_data)
+    response = await client.post("/api/change-password", json=VALID_PASSWORD_CHANGE)
     
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-@pytest.mark.asyncio
 async def test_update_profile_unauthenticated(client):
     """Test updating profile without authentication fails"""
-    update_data = {
-        "username": "newusername",
-        "email": "newemail@example.com",
-        "first_name": "Jane",
-        "last_name": "Smith"
-    }
-    response = client.put("/api/profile", json=update_data)
+    response = await client.put("/api/profile", json=VALID_PROFILE_UPDATE)
     
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
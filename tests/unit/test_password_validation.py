@@ -17,63 +17,52 @@ class TestPasswordChangeValidation:
         assert valid_pwd.new_password == "NewPass@456"
         assert valid_pwd.old_password == "OldPass@123"
 
-    def test_password_too_short(self):
-        """Test password too short fails"""
-        with pytest.raises(ValidationError) as exc_info:
-            PasswordChange(
-                old_password="OldPass@123",
-                new_password="Pass@1",
-                confirm_password="Pass@1"
-            )
-        assert "at least 8 characters" in str(exc_info.value)
-
-    def test_password_no_uppercase(self):
-        """Test password without uppercase fails"""
-        with pytest.raises(ValidationError) as exc_info:
+    @pytest.mark.parametrize(
+        "new_password, error",
+        [
+            ("Pass@1", "at least 8 characters"),
+            ("newpass@456", "uppercase"),
+            ("NEWPASS@456", "lowercase"),
+            ("NewPass@NoDigit", "digit"),
+            ("NewPass456", "special character"),
+        ],
+        ids=["too_short", "no_uppercase", "no_lowercase", "no_digit", "no_special_char"]
+    )
+    def test_invalid_new_password(self, new_password, error):
+        """Test each password policy violation fails with its own message"""
+        with pytest.raises(ValidationError, match=error):
             PasswordChange(
                 old_password="OldPass@123",
-                new_password="newpass@456",
-                confirm_password="newpass@456"
+                new_password=new_password,
+                confirm_password=new_password
             )
-        assert "uppercase" in str(exc_info.value)
 
-    def test_password_no_lowercase(self):
-        """Test password without lowercase fails"""
-        with pytest.raises(ValidationError) as exc_info:
-            PasswordChange(
-                old_password="OldPass@123",
-                new_password="NEWPASS@456",
-                confirm_password="NEWPASS@456"
-            )
-        assert "lowercase" in str(exc_info.value)
-
-    def test_password_no_digit(self):
-        """Test password without digit fails"""
-        with pytest.raises(ValidationError) as exc_info:
-            PasswordChange(
-                old_password="OldPass@123",
-                new_password="NewPass@NoDigit",
-                confirm_password="NewPass@NoDigit"
-            )
-        assert "digit" in str(exc_info.value)
+    def test_password_non_ascii_letters(self):
+        """Test non-ASCII upper/lowercase letters satisfy the case rules"""
+        valid_pwd = PasswordChange(
+            old_password="OldPass@123",
+            new_password="Ébcdefg1!",
+            confirm_password="Ébcdefg1!"
+        )
+        assert valid_pwd.new_password == "Ébcdefg1!"
 
-    def test_password_no_special_char(self):
-        """Test password without special char fails"""
+    def test_passwords_dont_match(self):
+        """Test passwords that don't match fail"""
         with pytest.raises(ValidationError) as exc_info:
             PasswordChange(
                 old_password="OldPass@123",
-                new_password="NewPass456",
-                confirm_password="NewPass456"
+                new_password="NewPass@456",
+                confirm_password="Different@456"
             )
-        assert "special character" in str(exc_info.value)
+        assert "do not match" in str(exc_info.value)
 
-    def test_passwords_dont_match(self):
-        """Test passwords that don't match fail"""
+    def test_passwords_dont_match_non_ascii(self):
+        """Test non-ASCII confirmation mismatch is a validation error"""
         with pytest.raises(ValidationError) as exc_info:
             PasswordChange(
                 old_password="OldPass@123",
                 new_password="NewPass@456",
-                confirm_password="Different@456"
+                confirm_password="NëwPass@456"
             )
         assert "do not match" in str(exc_info.value)
 
@@ -124,6 +113,27 @@ class TestUserProfileUpdateValidation:
             )
         assert "can only contain" in str(exc_info.value)
 
+    @pytest.mark.parametrize("username", ["___", "---", "_-_"])
+    def test_username_only_punctuation(self, username):
+        """Test username without any letter or number fails"""
+        with pytest.raises(ValidationError, match="at least one letter or number"):
+            UserProfileUpdate(
+                username=username,
+                email="new@example.com",
+                first_name="Jane",
+                last_name="Smith"
+            )
+
+    def test_username_non_ascii_letters(self):
+        """Test username with non-ASCII letters fails (ASCII only)"""
+        with pytest.raises(ValidationError, match="can only contain"):
+            UserProfileUpdate(
+                username="jöhn",
+                email="new@example.com",
+                first_name="Jane",
+                last_name="Smith"
+            )
+
     def test_first_name_empty(self):
         """Test empty first name fails"""
         with pytest.raises(ValidationError) as exc_info:
@@ -0,0 +1,131 @@
+"""Unit tests for the Redis token blacklist helpers."""
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.auth import redis as blacklist
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+class FakePipeline:
+    """Minimal stand-in for a redis.asyncio pipeline backed by a set of keys."""
+
+    def __init__(self, client):
+        self.client = client
+        self.keys = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def exists(self, key):
+        self.keys.append(key)
+
+    async def execute(self):
+        self.client.queried.append(list(self.keys))
+        if self.client.down:
+            raise ConnectionError("Redis is down")
+        return [int(key in self.client.store) for key in self.keys]
+
+
+@pytest.fixture
+def mock_redis():
+    """Replace the Redis client with a fake and start with an empty cache."""
+    client = MagicMock()
+    client.store = set()
+    client.queried = []
+    client.down = False
+    client.pipeline.side_effect = lambda transaction: FakePipeline(client)
+    client.setex = AsyncMock()
+    blacklist._neg_cache.clear()
+    blacklist._breaker_until = 0
+    with patch.object(blacklist, "get_redis_client", MagicMock(return_value=client)):
+        yield client
+    blacklist._neg_cache.clear()
+    blacklist._breaker_until = 0
+
+
+async def test_is_blacklisted_caches_negative_result(mock_redis):
+    """A JTI confirmed as not blacklisted is not looked up again"""
+    assert await blacklist.is_blacklisted("jti-1") is False
+    assert await blacklist.is_blacklisted("jti-1") is False
+    assert mock_redis.queried == [["blacklist:jti-1"]]
+
+
+async def test_is_blacklisted_does_not_cache_positive_result(mock_redis):
+    """Blacklisted JTIs are always checked against Redis"""
+    mock_redis.store.add("blacklist:jti-2")
+    assert await blacklist.is_blacklisted("jti-2") is True
+    assert await blacklist.is_blacklisted("jti-2") is True
+    assert len(mock_redis.queried) == 2
+
+
+async def test_negative_cache_entry_expires(mock_redis):
+    """Expired cache entries fall through to Redis"""
+    await blacklist.is_blacklisted("jti-3")
+    blacklist._neg_cache["jti-3"] = 0
+    await blacklist.is_blacklisted("jti-3")
+    assert len(mock_redis.queried) == 2
+
+
+async def test_add_to_blacklist_evicts_cached_jti(mock_redis):
+    """Blacklisting a token drops its cached negative answer"""
+    await blacklist.is_blacklisted("jti-4")
+    await blacklist.add_to_blacklist("jti-4", 60)
+    mock_redis.setex.assert_awaited_once_with("blacklist:jti-4", 60, "1")
+
+    mock_redis.store.add("blacklist:jti-4")
+    assert await blacklist.is_blacklisted("jti-4") is True
+
+
+async def test_negative_cache_is_size_capped(mock_redis):
+    """The oldest entry is dropped once the cache is full"""
+    with patch.object(blacklist, "_NEG_CACHE_SIZE", 2):
+        for jti in ("a", "b", "c"):
+            await blacklist.is_blacklisted(jti)
+    assert list(blacklist._neg_cache) == ["b", "c"]
+
+
+async def test_are_blacklisted_uses_single_pipeline(mock_redis):
+    """Several JTIs are checked in one pipelined round-trip"""
+    mock_redis.store.add("blacklist:revoked")
+    result = await blacklist.are_blacklisted(["ok-1", "revoked", "ok-2"])
+    assert result == [False, True, False]
+    assert mock_redis.queried == [
+        ["blacklist:ok-1", "blacklist:revoked", "blacklist:ok-2"]
+    ]
+
+
+async def test_are_blacklisted_skips_cached_jtis(mock_redis):
+    """Only JTIs without a cached negative answer are sent to Redis"""
+    await blacklist.is_blacklisted("cached")
+    result = await blacklist.are_blacklisted(["cached", "fresh"])
+    assert result == [False, False]
+    assert mock_redis.queried[-1] == ["blacklist:fresh"]
+
+
+async def test_breaker_skips_redis_after_failure(mock_redis):
+    """After a failure, calls return immediately without touching Redis"""
+    mock_redis.down = True
+    assert await blacklist.is_blacklisted("jti-5") is False
+    assert await blacklist.is_blacklisted("jti-6") is False
+    await blacklist.add_to_blacklist("jti-6", 60)
+    assert len(mock_redis.queried) == 1
+    mock_redis.setex.assert_not_awaited()
+
+
+async def test_breaker_closes_after_cooldown(mock_redis):
+    """Redis is retried once the cooldown has passed, and success closes the breaker"""
+    mock_redis.down = True
+    await blacklist.is_blacklisted("jti-7")
+    assert blacklist._breaker_open()
+
+    mock_redis.down = False
+    blacklist._breaker_until = time.monotonic() - 1
+    mock_redis.store.add("blacklist:jti-7")
+    assert await blacklist.is_blacklisted("jti-7") is True
+    assert blacklist._breaker_until == 0
@@ -0,0 +1,67 @@
+"""Unit tests for the user registration schema."""
+import pytest
+from pydantic import ValidationError
+from app.schemas.user import UserCreate
+
+VALID_REGISTRATION = {
+    "username": "johndoe",
+    "email": "john@example.com",
+    "password": "SecurePass@123",
+    "confirm_password": "SecurePass@123",
+    "first_name": "John",
+    "last_name": "Doe"
+}
+
+
+class TestUserCreateValidation:
+    """Test UserCreate schema validation."""
+
+    def test_registration_valid(self):
+        """Test valid registration data passes validation"""
+        user = UserCreate(**VALID_REGISTRATION)
+        assert user.username == "johndoe"
+        assert user.email == "john@example.com"
+
+    def test_names_are_stripped(self):
+        """Test surrounding whitespace is removed from names"""
+        user = UserCreate(**{**VALID_REGISTRATION, "first_name": "  John ", "last_name": " Doe"})
+        assert user.first_name == "John"
+        assert user.last_name == "Doe"
+
+    def test_passwords_dont_match(self):
+        """Test mismatched confirmation fails"""
+        with pytest.raises(ValidationError, match="do not match"):
+            UserCreate(**{**VALID_REGISTRATION, "confirm_password": "Different@123"})
+
+    @pytest.mark.parametrize(
+        "field",
+        ["username", "email", "password", "confirm_password", "first_name", "last_name"]
+    )
+    def test_missing_field(self, field):
+        """Test every field is required"""
+        data = {k: v for k, v in VALID_REGISTRATION.items() if k != field}
+        with pytest.raises(ValidationError, match="Field required"):
+            UserCreate(**data)
+
+    @pytest.mark.parametrize(
+        "field, value, error",
+        [
+            ("email", "not-an-email", "valid email"),
+            ("username", "ab", "at least 3 characters"),
+            ("username", "user@name", "can only contain"),
+            ("username", "___", "at least one letter or number"),
+            ("first_name", "   ", "cannot be empty"),
+            ("password", "weakpass", "uppercase"),
+        ],
+        ids=[
+            "bad_email", "short_username", "bad_username_chars", "punctuation_username",
+            "blank_name", "weak_password"
+        ]
+    )
+    def test_invalid_field(self, field, value, error):
+        """Test each invalid field fails with its own message"""
+        data = {**VALID_REGISTRATION, field: value}
+        if field == "password":
+            data["confirm_password"] = value
+        with pytest.raises(ValidationError, match=error):
+            UserCreate(**data)